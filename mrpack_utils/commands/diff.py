@@ -1,24 +1,28 @@
 from collections.abc import Mapping
 
-from mrpack_utils.mods import Modpack
+from mrpack_utils.mods import Modpack, MrpackSource
 from mrpack_utils.output import Element, MissingMods, Table
 
 
-def _diff(old: Mapping[str, str], new: Mapping[str, str]) -> list[tuple[str, str, str]]:
-    kept_keys = old.keys() & new.keys()
-    added_keys = new.keys() - old.keys()
-    removed_keys = old.keys() - new.keys()
+def _diff(old: Mapping[str, str], new: Mapping[str, str]) -> tuple[tuple[str, str, str], ...]:
+    if old is new:
+        return ()
 
-    updated_keys = {k for k in kept_keys if new[k] != old[k]}
+    # Only the changed keys are sorted; unchanged ones usually dominate
+    old_keys = old.keys()
+    new_keys = new.keys()
+    updated = sorted((k for k in old_keys & new_keys if old[k] != new[k]), key=str.lower)
+    added = sorted(new_keys - old_keys, key=str.lower)
+    removed = sorted(old_keys - new_keys, key=str.lower)
 
-    return [
-        *[(k, old[k], new[k]) for k in sorted(updated_keys, key=lambda s: s.lower())],
-        *[(k, "", new[k]) for k in sorted(added_keys, key=lambda s: s.lower())],
-        *[(k, old[k], "") for k in sorted(removed_keys, key=lambda s: s.lower())],
-    ]
+    return (
+        *((k, old[k], new[k]) for k in updated),
+        *((k, "", new[k]) for k in added),
+        *((k, old[k], "") for k in removed),
+    )
 
 
-def _modpack_data(old: Modpack, new: Modpack) -> list[tuple[str, str, str]]:
+def _modpack_data(old: Modpack, new: Modpack) -> tuple[tuple[str, str, str], ...]:
     out = []
     if old.name != new.name:
         out.append(("modpack name", old.name, new.name))
@@ -27,25 +31,28 @@ def _modpack_data(old: Modpack, new: Modpack) -> list[tuple[str, str, str]]:
     if old.game_version != new.game_version:
         out.append(("minecraft", str(old.game_version), str(new.game_version)))
 
-    return out + _diff(old.dependencies, new.dependencies)
+    return (*out, *_diff(old.dependencies, new.dependencies))
+
 
+def _mods(old: Modpack, new: Modpack) -> tuple[tuple[str, str, str], ...]:
+    if old is new:
+        return ()
 
-def _mods(old: Modpack, new: Modpack) -> list[tuple[str, str, str]]:
     return _diff(
         {mod.name: mod.version for mod in old.mods.values()},
         {mod.name: mod.version for mod in new.mods.values()},
     )
 
 
-def _unknown_mods(old: Modpack, new: Modpack) -> list[tuple[str, str, str]]:
+def _unknown_mods(old: Modpack, new: Modpack) -> tuple[tuple[str, str, str], ...]:
     return _diff(old.unknown_mods, new.unknown_mods)
 
 
-def _other_files(old: Modpack, new: Modpack) -> list[tuple[str, str, str]]:
+def _other_files(old: Modpack, new: Modpack) -> tuple[tuple[str, str, str], ...]:
     return _diff(old.other_files, new.other_files)
 
 
-def run(old_file: str, new_file: str) -> tuple[Element, ...]:
+def run(old_file: MrpackSource, new_file: MrpackSource) -> tuple[Element, ...]:
     old, new = Modpack.from_files(old_file, new_file)
 
     return (
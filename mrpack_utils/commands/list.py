@@ -1,11 +1,10 @@
-from collections.abc import Sequence, Set
+import functools
+from collections.abc import Mapping, Sequence, Set
 
-from frozendict import frozendict
-
-from mrpack_utils.mods import GameVersion, Mod, Modpack
+from mrpack_utils.mods import GameVersion, Mod, Modpack, MrpackSource
 from mrpack_utils.output import Element, IncompatibleMods, MissingMods, Table
 
-IncompatibleModMap = frozendict[GameVersion, frozenset[Mod]]
+IncompatibleModMap = Mapping[GameVersion, Set[Mod]]
 
 _NAME = "Name"
 _LINK = "Link"
@@ -20,22 +19,29 @@ _SOURCE = "Source"
 _ISSUES = "Issues"
 
 
-def _headers(game_versions: Set[GameVersion], dev: bool) -> list[str]:
-    out = [_NAME, _LINK, _INSTALLED_VERSION, _CLIENT, _SERVER, _LATEST_GAME_VERSION] + [
-        str(version) for version in sorted(game_versions)
-    ]
-    if dev:
-        out += [_LICENSE, _MODRINTH_CLIENT, _MODRINTH_SERVER, _SOURCE, _ISSUES]
-    return out
+@functools.cache
+def _headers(game_versions: frozenset[GameVersion], dev: bool) -> tuple[str, ...]:
+    return (
+        _NAME,
+        _LINK,
+        _INSTALLED_VERSION,
+        _CLIENT,
+        _SERVER,
+        _LATEST_GAME_VERSION,
+        *(str(version) for version in sorted(game_versions)),
+        *((_LICENSE, _MODRINTH_CLIENT, _MODRINTH_SERVER, _SOURCE, _ISSUES) if dev else ()),
+    )
 
 
-def _empty_row(headers: Sequence[str]) -> list[str]:
-    return [""] * len(headers)
+def _empty_row(headers: Sequence[str]) -> tuple[str, ...]:
+    return ("",) * len(headers)
 
 
 def _modpack_data(modpack: Modpack, headers: Sequence[str]) -> list[list[str]]:
+    empty = _empty_row(headers)
+
     def _row(name: str, version: str) -> list[str]:
-        row = _empty_row(headers)
+        row = list(empty)
         row[headers.index(_NAME)] = name
         row[headers.index(_INSTALLED_VERSION)] = version
         return row
@@ -54,10 +60,15 @@ def _mods(
     game_versions: Set[GameVersion],
     dev: bool,
 ) -> tuple[list[list[str]], IncompatibleModMap]:
-    incompatible: dict[GameVersion, set[Mod]] = {version: set() for version in game_versions}
+    sorted_versions = sorted(game_versions)
     out = []
+    incompatible: dict[GameVersion, set[Mod]] = {version: set() for version in game_versions}
 
     for mod in sorted(modpack.mods.values(), key=lambda m: m.name.lower()):
+        compatible = [mod.compatible_with(version) for version in sorted_versions]
+        for version, ok in zip(sorted_versions, compatible, strict=True):
+            if not ok:
+                incompatible[version].add(mod)
         row = [
             mod.name,
             mod.link,
@@ -65,13 +76,8 @@ def _mods(
             mod.overridden_env.client.name.lower(),
             mod.overridden_env.server.name.lower(),
             str(mod.latest_game_version),
+            *("yes" if ok else "no" for ok in compatible),
         ]
-        for version in sorted(game_versions):
-            if mod.compatible_with(version):
-                row.append("yes")
-            else:
-                row.append("no")
-                incompatible[version].add(mod)
         if dev:
             row += [
                 mod.mod_license,
@@ -82,9 +88,7 @@ def _mods(
             ]
         out.append(row)
 
-    return out, frozendict(
-        {version: frozenset(incompatible[version]) for version in incompatible},
-    )
+    return out, incompatible
 
 
 def _unknown_mods(
@@ -112,8 +116,9 @@ def _unknown_mods(
 
 def _other_files(modpack: Modpack, headers: Sequence[str]) -> list[list[str]]:
     out = []
+    empty = _empty_row(headers)
     for name, version in sorted(modpack.other_files.items(), key=lambda i: i[0].lower()):
-        row = _empty_row(headers)
+        row = list(empty)
         row[headers.index(_NAME)] = name
         row[headers.index(_INSTALLED_VERSION)] = version
         row[headers.index(_LINK)] = "non-mod file"
@@ -122,13 +127,12 @@ def _other_files(modpack: Modpack, headers: Sequence[str]) -> list[list[str]]:
 
 
 def run(
-    mrpack_file: str,
+    mrpack_file: MrpackSource,
     game_versions: Set[GameVersion],
     dev: bool,
 ) -> tuple[Element, ...]:
     (modpack,) = Modpack.from_files(mrpack_file)
-    game_versions = set(game_versions)
-    game_versions.add(modpack.game_version)
+    game_versions = frozenset(game_versions) | {modpack.game_version}
 
     headers = _headers(game_versions, dev)
     modpack_data = _modpack_data(modpack, headers)
@@ -136,20 +140,18 @@ def run(
     unknown_mods = _unknown_mods(modpack, game_versions, dev)
     other_files = _other_files(modpack, headers)
 
-    return tuple(
-        [
-            Table(
-                [
-                    headers,
-                    *modpack_data,
-                    *mods,
-                    *unknown_mods,
-                    *other_files,
-                ],
-            ),
-            MissingMods(modpack.missing_mods),
-        ]
-        + [
+    return (
+        Table(
+            [
+                headers,
+                *modpack_data,
+                *mods,
+                *unknown_mods,
+                *other_files,
+            ],
+        ),
+        MissingMods(modpack.missing_mods),
+        *(
             IncompatibleMods(
                 num_mods=len(modpack.mods),
                 game_version=str(version),
@@ -157,5 +159,5 @@ def run(
                 curseforge_warning=len(modpack.unknown_mods) > 0,
             )
             for version in sorted(game_versions)
-        ],
+        ),
     )
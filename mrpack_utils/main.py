@@ -1,10 +1,11 @@
 import argparse
+import sys
 from collections.abc import Sequence
 
 import mrpack_utils.commands.diff
 import mrpack_utils.commands.list
 from mrpack_utils.mods import GameVersion
-from mrpack_utils.output import render, render_csv
+from mrpack_utils.output import render, write_csv
 
 
 def main(argv: Sequence[str] | None = None) -> None:  # pragma: no cover
@@ -56,6 +57,6 @@ def main(argv: Sequence[str] | None = None) -> None:  # pragma: no cover
         raise NotImplementedError("Unknown subcommand")
 
     if args.csv:
-        print(render_csv(out))
+        write_csv(out, sys.stdout)
     else:
         print(render(out))
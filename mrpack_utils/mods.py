@@ -1,14 +1,16 @@
 import contextlib
 import functools
 import json
-import pathlib
 import re
+import sys
 import zipfile
 from collections.abc import Mapping, Sequence, Set
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, TypeAlias, cast
+from typing import Any, BinaryIO, ClassVar, TypeAlias, cast
 
+import orjson
 import requests
 from frozendict import frozendict
 from requests.utils import requote_uri
@@ -20,6 +22,22 @@ class ModpackError(Exception):
 
 VersionHash: TypeAlias = str
 ProjectID: TypeAlias = str
+# A path to an mrpack file, or an open binary file containing one
+MrpackSource: TypeAlias = str | BinaryIO
+
+# Modrinth API requests are split into batches of at most this many items, sent concurrently
+_BATCH_SIZE = 100
+_MAX_REQUESTS = 8
+
+# Shared so that concurrent requests reuse connections to the API
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "calliecameron/mrpack-utils"
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=_MAX_REQUESTS))
+
+
+def _batches(items: Set[str]) -> list[list[str]]:
+    ordered = sorted(items)
+    return [ordered[i : i + _BATCH_SIZE] for i in range(0, len(ordered), _BATCH_SIZE)]
 
 
 class Requirement(Enum):
@@ -29,43 +47,65 @@ class Requirement(Enum):
     UNSUPPORTED = auto()
 
     @staticmethod
-    def from_str(s: str) -> "Requirement":
-        if not s or s == "unknown":
-            return Requirement.UNKNOWN
-        if s == "required":
-            return Requirement.REQUIRED
-        if s == "optional":
-            return Requirement.OPTIONAL
-        if s == "unsupported":
-            return Requirement.UNSUPPORTED
-        raise ValueError(
-            "Requirement value must be one of {required, optional, unsupported}, got '" + s + "'",
-        )
+    def from_str(s: str | None) -> "Requirement":
+        try:
+            # The API sometimes returns None instead of a string
+            return _REQUIREMENTS[s or ""]
+        except KeyError:
+            raise ValueError(
+                f"Requirement value must be one of {{required, optional, unsupported}}, got '{s}'",
+            ) from None
+
 
+_REQUIREMENTS = {
+    "": Requirement.UNKNOWN,
+    "unknown": Requirement.UNKNOWN,
+    "required": Requirement.REQUIRED,
+    "optional": Requirement.OPTIONAL,
+    "unsupported": Requirement.UNSUPPORTED,
+}
 
-@dataclass(frozen=True, kw_only=True)
+
+@dataclass(frozen=True, kw_only=True, slots=True)
 class Env:
     client: Requirement
     server: Requirement
 
+    @staticmethod
+    @functools.cache
+    def of(client: Requirement, server: Requirement) -> "Env":
+        # There are only a few distinct Envs, so mods share one instance of each
+        return Env(client=client, server=server)
+
     @staticmethod
     def from_dict(env: Mapping[str, str]) -> "Env":
         if env.keys() != frozenset(["client", "server"]):
             raise ValueError("Env must have keys {client, server}, got " + str(env.keys()))
-        return Env(
-            client=Requirement.from_str(env["client"]),
-            server=Requirement.from_str(env["server"]),
-        )
+        return Env.of(Requirement.from_str(env["client"]), Requirement.from_str(env["server"]))
+
+
+_GAME_VERSION_RE = re.compile(r"[0-9]+\.[0-9]+(\.[0-9]+)?")
 
 
-@functools.total_ordering
 class GameVersion:
-    def __init__(self, version: str) -> None:
-        super().__init__()
-        match = re.fullmatch(r"[0-9]+\.[0-9]+(\.[0-9]+)?", version)
-        if match is None:
-            raise ValueError("Not a valid game version: " + version)
-        self._version = tuple(int(segment) for segment in version.split("."))
+    __slots__ = ("_version", "_hash")
+
+    _version: tuple[int, ...]
+    _hash: int
+    # Instances are immutable, so each distinct version string is only parsed once
+    _instances: ClassVar[dict[str, "GameVersion"]] = {}
+
+    def __new__(cls, version: str) -> "GameVersion":
+        instance = cls._instances.get(version)
+        if instance is None:
+            match = _GAME_VERSION_RE.fullmatch(version)
+            if match is None:
+                raise ValueError("Not a valid game version: " + version)
+            instance = super().__new__(cls)
+            instance._version = tuple(int(segment) for segment in version.split("."))  # noqa: SLF001
+            instance._hash = hash(instance._version)  # noqa: SLF001
+            cls._instances[version] = instance
+        return instance
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, GameVersion):
@@ -73,27 +113,83 @@ class GameVersion:
         return self._version == other._version
 
     def __hash__(self) -> int:
-        return hash(self._version)
+        return self._hash
 
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, GameVersion):
             raise NotImplementedError
         return self._version < other._version
 
+    def __le__(self, other: object) -> bool:
+        if not isinstance(other, GameVersion):
+            raise NotImplementedError
+        return self._version <= other._version
+
+    def __gt__(self, other: object) -> bool:
+        if not isinstance(other, GameVersion):
+            raise NotImplementedError
+        return self._version > other._version
+
+    def __ge__(self, other: object) -> bool:
+        if not isinstance(other, GameVersion):
+            raise NotImplementedError
+        return self._version >= other._version
+
     def __repr__(self) -> str:
         return ".".join(str(segment) for segment in self._version)
 
+    # __new__ needs the version string, so copies and pickles must go back through it; this also
+    # keeps them interned
+    def __reduce__(self) -> tuple[type["GameVersion"], tuple[str]]:
+        return (GameVersion, (str(self),))
+
+    def __copy__(self) -> "GameVersion":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "GameVersion":
+        return self
+
+    @staticmethod
+    @functools.cache
+    def _parse(version: str) -> "GameVersion | None":
+        # Also remembers the strings that don't parse, so they only raise once
+        with contextlib.suppress(ValueError):
+            return GameVersion(version)
+        return None
+
     @staticmethod
     def from_list(versions: Sequence[str]) -> "frozenset[GameVersion]":
         # We deliberately skip over any versions that don't parse
-        out = set()
-        for version in versions:
-            with contextlib.suppress(ValueError):
-                out.add(GameVersion(version))
-        return frozenset(out)
+        return frozenset(filter(None, map(GameVersion._parse, versions)))
+
+
+_MOD_OVERRIDE_DIRS = frozenset(["overrides/mods", "server-overrides/mods", "client-overrides/mods"])
+
+
+def _is_override_mod(filename: str) -> bool:
+    # Normalised the way PurePosixPath does: empty and "." segments are dropped
+    if filename.startswith("/"):
+        return False
+    *parent, name = [part for part in filename.split("/") if part not in ("", ".")] or [""]
+    # Like PurePath.suffix, a bare ".jar" has no suffix
+    return (
+        len(name) > len(".jar") and name.endswith(".jar") and "/".join(parent) in _MOD_OVERRIDE_DIRS
+    )
 
 
 class _MrpackFile:
+    __slots__ = (
+        "_name",
+        "_version",
+        "_game_version",
+        "_dependencies",
+        "_mod_hashes",
+        "_mod_jars",
+        "_mod_envs",
+        "_unknown_mods",
+        "_other_files",
+    )
+
     def __init__(
         self,
         *,
@@ -155,45 +251,41 @@ class _MrpackFile:
         return self._other_files
 
     @staticmethod
-    def from_file(filename: str) -> "_MrpackFile":
+    def from_file(source: MrpackSource) -> "_MrpackFile":
         try:
-            with zipfile.ZipFile(filename) as z:
+            with zipfile.ZipFile(source) as z:
                 with z.open("modrinth.index.json") as f:
-                    j = json.load(f)
+                    j = orjson.loads(f.read())
 
                 unknown_mods: dict[str, str] = {}
                 other_files: dict[str, str] = {}
                 for file in z.infolist():
                     if file.filename != "modrinth.index.json" and not file.is_dir():
-                        path = pathlib.PurePath(file.filename)
-                        if path.suffix == ".jar" and str(path.parent) in (
-                            "overrides/mods",
-                            "server-overrides/mods",
-                            "client-overrides/mods",
-                        ):
-                            target = unknown_mods
-                        else:
-                            target = other_files
+                        target = unknown_mods if _is_override_mod(file.filename) else other_files
                         target[file.filename] = f"{file.CRC:08x}"
 
             dependencies = j["dependencies"]
             game_version = dependencies["minecraft"]
             del dependencies["minecraft"]
 
+            mod_hashes: set[VersionHash] = set()
+            mod_jars: dict[VersionHash, str] = {}
+            mod_envs: dict[VersionHash, Env] = {}
+            for mod_file in j["files"]:
+                mod_hash = mod_file["hashes"]["sha512"]
+                mod_hashes.add(mod_hash)
+                mod_jars[mod_hash] = mod_file["path"].split("/")[-1]
+                if "env" in mod_file:
+                    mod_envs[mod_hash] = Env.from_dict(mod_file["env"])
+
             return _MrpackFile(
                 name=j["name"],
                 version=j["versionId"],
                 game_version=GameVersion(game_version),
                 dependencies=dependencies,
-                mod_hashes=frozenset(file["hashes"]["sha512"] for file in j["files"]),
-                mod_jars={
-                    file["hashes"]["sha512"]: file["path"].split("/")[-1] for file in j["files"]
-                },
-                mod_envs={
-                    file["hashes"]["sha512"]: Env.from_dict(file["env"])
-                    for file in j["files"]
-                    if "env" in file
-                },
+                mod_hashes=mod_hashes,
+                mod_jars=mod_jars,
+                mod_envs=mod_envs,
                 unknown_mods=unknown_mods,
                 other_files=other_files,
             )
@@ -201,7 +293,7 @@ class _MrpackFile:
             raise ModpackError("Failed to load mrpack file: " + str(e)) from e
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class _ModStub:
     name: str
     slug: str
@@ -213,6 +305,19 @@ class _ModStub:
 
 
 class Mod:
+    __slots__ = (
+        "_name",
+        "_link",
+        "_version",
+        "_original_env",
+        "_overridden_env",
+        "_mod_license",
+        "_source_url",
+        "_issues_url",
+        "_game_versions",
+        "_latest_game_version",
+    )
+
     def __init__(
         self,
         *,
@@ -236,7 +341,7 @@ class Mod:
         self._source_url = requote_uri(source_url)
         self._issues_url = requote_uri(issues_url)
         self._game_versions = frozenset(game_versions)
-        self._latest_game_version = max(self._game_versions)
+        self._latest_game_version: GameVersion | None = None
 
     @property
     def name(self) -> str:
@@ -276,6 +381,8 @@ class Mod:
 
     @property
     def latest_game_version(self) -> GameVersion:
+        if self._latest_game_version is None:
+            self._latest_game_version = max(self._game_versions)
         return self._latest_game_version
 
     def compatible_with(self, version: GameVersion) -> bool:
@@ -283,6 +390,17 @@ class Mod:
 
 
 class Modpack:
+    __slots__ = (
+        "_name",
+        "_version",
+        "_game_version",
+        "_dependencies",
+        "_mods",
+        "_missing_mods",
+        "_unknown_mods",
+        "_other_files",
+    )
+
     def __init__(
         self,
         *,
@@ -338,16 +456,23 @@ class Modpack:
         return self._other_files
 
     @staticmethod
-    def _fetch_versions(
-        hashes: Set[VersionHash],
-    ) -> tuple[dict[VersionHash, dict[str, Any]], frozenset[VersionHash]]:
-        versions_response = requests.post(
+    def _fetch_version_batch(hashes: Sequence[VersionHash]) -> dict[VersionHash, dict[str, Any]]:
+        versions_response = _SESSION.post(
             "https://api.modrinth.com/v2/version_files",
-            json={"hashes": sorted(hashes), "algorithm": "sha512"},
+            json={"hashes": list(hashes), "algorithm": "sha512"},
             timeout=10,
         )
         versions_response.raise_for_status()
-        versions = versions_response.json()
+        return cast(dict[VersionHash, dict[str, Any]], orjson.loads(versions_response.content))
+
+    @staticmethod
+    def _fetch_versions(
+        hashes: Set[VersionHash],
+    ) -> tuple[dict[VersionHash, dict[str, Any]], frozenset[VersionHash]]:
+        versions: dict[VersionHash, dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=_MAX_REQUESTS) as executor:
+            for batch in executor.map(Modpack._fetch_version_batch, _batches(hashes)):
+                versions.update(batch)
 
         known_hashes = frozenset(
             {
@@ -360,15 +485,23 @@ class Modpack:
         return versions, known_hashes
 
     @staticmethod
-    def _fetch_projects(versions: Mapping[VersionHash, Mapping[str, Any]]) -> list[dict[str, Any]]:
-        ids = {versions[mod_hash]["project_id"] for mod_hash in versions}
-        projects_response = requests.get(
+    def _fetch_project_batch(ids: Sequence[ProjectID]) -> list[dict[str, Any]]:
+        projects_response = _SESSION.get(
             "https://api.modrinth.com/v2/projects",
-            {"ids": "[" + ", ".join(f'"{mod_id}"' for mod_id in sorted(ids)) + "]"},
+            params={"ids": json.dumps(ids)},
             timeout=10,
         )
         projects_response.raise_for_status()
-        return cast(list[dict[str, Any]], projects_response.json())
+        return cast(list[dict[str, Any]], orjson.loads(projects_response.content))
+
+    @staticmethod
+    def _fetch_projects(versions: Mapping[VersionHash, Mapping[str, Any]]) -> list[dict[str, Any]]:
+        ids = {versions[mod_hash]["project_id"] for mod_hash in versions}
+        projects = []
+        with ThreadPoolExecutor(max_workers=_MAX_REQUESTS) as executor:
+            for batch in executor.map(Modpack._fetch_project_batch, _batches(ids)):
+                projects.extend(batch)
+        return projects
 
     @staticmethod
     def _load(*mrpacks: _MrpackFile) -> "tuple[Modpack, ...]":
@@ -380,45 +513,49 @@ class Modpack:
         projects = Modpack._fetch_projects(versions)
 
         mod_stubs = {}
-        for project in projects:
-            try:
+        try:
+            for project in projects:
                 mod_stubs[project["id"]] = _ModStub(
                     name=project["title"],
                     slug=project["slug"],
-                    env=Env(
-                        client=Requirement.from_str(project.get("client_side", "")),
-                        server=Requirement.from_str(project.get("server_side", "")),
+                    env=Env.of(
+                        Requirement.from_str(project.get("client_side", "")),
+                        Requirement.from_str(project.get("server_side", "")),
+                    ),
+                    # A handful of license ids are shared by most projects
+                    mod_license=(
+                        "" if "license" not in project else sys.intern(project["license"]["id"])
                     ),
-                    mod_license="" if "license" not in project else project["license"]["id"],
                     # Sometimes the API returns None for these - force them to be strings
                     source_url=project.get("source_url", "") or "",
                     issues_url=project.get("issues_url", "") or "",
                     game_versions=GameVersion.from_list(project["game_versions"]),
                 )
-            except Exception as e:  # noqa: PERF203  # pragma nocover
-                raise ModpackError(f"Failed to load mod {project['title']}: {e}") from e
+        except Exception as e:  # pragma nocover
+            raise ModpackError(f"Failed to load mod {project['title']}: {e}") from e
 
         modpacks = []
         for mrpack in mrpacks:
             mods = {}
-            missing_mods = set()
-            for mod_hash in mrpack.mod_hashes:
-                if mod_hash in known_hashes:
-                    mod_id = versions[mod_hash]["project_id"]
-                    mod_stub = mod_stubs[mod_id]
-                    mods[mod_id] = Mod(
-                        name=mod_stub.name,
-                        slug=mod_stub.slug,
-                        version=versions[mod_hash]["version_number"],
-                        original_env=mod_stub.env,
-                        overridden_env=mrpack.mod_envs.get(mod_hash, mod_stub.env),
-                        mod_license=mod_stub.mod_license,
-                        source_url=mod_stub.source_url,
-                        issues_url=mod_stub.issues_url,
-                        game_versions=mod_stub.game_versions,
-                    )
-                else:
-                    missing_mods.add(mrpack.mod_jars[mod_hash])
+            mod_envs = mrpack.mod_envs
+            for mod_hash in mrpack.mod_hashes & known_hashes:
+                version = versions[mod_hash]
+                mod_id = version["project_id"]
+                mod_stub = mod_stubs[mod_id]
+                mods[mod_id] = Mod(
+                    name=mod_stub.name,
+                    slug=mod_stub.slug,
+                    version=version["version_number"],
+                    original_env=mod_stub.env,
+                    overridden_env=mod_envs.get(mod_hash, mod_stub.env),
+                    mod_license=mod_stub.mod_license,
+                    source_url=mod_stub.source_url,
+                    issues_url=mod_stub.issues_url,
+                    game_versions=mod_stub.game_versions,
+                )
+            missing_mods = {
+                mrpack.mod_jars[mod_hash] for mod_hash in mrpack.mod_hashes - known_hashes
+            }
             modpacks.append(
                 Modpack(
                     name=mrpack.name,
@@ -435,5 +572,11 @@ class Modpack:
         return tuple(modpacks)
 
     @staticmethod
-    def from_files(*files: str) -> "tuple[Modpack, ...]":
-        return Modpack._load(*[_MrpackFile.from_file(f) for f in files])
+    def from_files(*files: MrpackSource) -> "tuple[Modpack, ...]":
+        if len(files) <= 1:
+            return Modpack._load(*(_MrpackFile.from_file(file) for file in files))
+        # Only the small index is decompressed, which releases the GIL; the central directory
+        # parsing is pure Python, so the overlap is limited to the file reads
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            mrpacks = list(executor.map(_MrpackFile.from_file, files))
+        return Modpack._load(*mrpacks)
@@ -2,6 +2,7 @@ import csv
 import io
 from abc import ABC, abstractmethod
 from collections.abc import Sequence, Set
+from typing import TextIO
 
 import tabulate
 from attrs import field, frozen
@@ -11,6 +12,10 @@ def _frozenset_converter(data: Set[str]) -> frozenset[str]:
     return frozenset(data)
 
 
+def _sorted_lower(data: Set[str]) -> tuple[str, ...]:
+    return tuple(sorted(data, key=str.lower))
+
+
 def _table_converter(data: Sequence[Sequence[str]]) -> tuple[tuple[str, ...], ...]:
     return tuple(tuple(row) for row in data)
 
@@ -28,21 +33,29 @@ class Table(Element):
     def render(self) -> str:
         return tabulate.tabulate(self.data, headers="firstrow", tablefmt="github")
 
+    def write_csv(self, stream: TextIO) -> None:
+        csv.writer(stream, lineterminator="\n").writerows(self.data)
+
     def render_csv(self) -> str:
         with io.StringIO() as f:
-            csv.writer(f, lineterminator="\n").writerows(self.data)
+            self.write_csv(f)
             return f.getvalue().rstrip()
 
 
 @frozen
 class MissingMods(Element):
     mods: frozenset[str] = field(converter=_frozenset_converter)
+    _sorted_mods: tuple[str, ...] = field(init=False, eq=False, repr=False)
+
+    @_sorted_mods.default
+    def _sorted_mods_default(self) -> tuple[str, ...]:
+        return _sorted_lower(self.mods)
 
     def render(self) -> str:
         out = []
         if self.mods:
             out.append("Mods supposed to be on Modrinth, but not found:")
-            out += ["  " + item for item in sorted(self.mods, key=lambda i: i.lower())]
+            out.extend(f"  {item}" for item in self._sorted_mods)
         return "\n".join(out)
 
 
@@ -52,6 +65,11 @@ class IncompatibleMods(Element):
     game_version: str
     mods: frozenset[str] = field(converter=_frozenset_converter)
     curseforge_warning: bool
+    _sorted_mods: tuple[str, ...] = field(init=False, eq=False, repr=False)
+
+    @_sorted_mods.default
+    def _sorted_mods_default(self) -> tuple[str, ...]:
+        return _sorted_lower(self.mods)
 
     def render(self) -> str:
         modrinth = ""
@@ -67,7 +85,7 @@ class IncompatibleMods(Element):
                 f"  {len(self.mods)} out of {self.num_mods}{modrinth} mods are incompatible with "
                 f"this version{warning}:",
             )
-            out += ["    " + mod for mod in sorted(self.mods, key=lambda m: m.lower())]
+            out.extend(f"    {mod}" for mod in self._sorted_mods)
         else:
             out.append(f"  All{modrinth} mods are compatible with this version{warning}")
         return "\n".join(out)
@@ -78,8 +96,19 @@ def render(elements: Sequence[Element]) -> str:
     return "\n\n".join([item for item in items if item])
 
 
-def render_csv(elements: Sequence[Element]) -> str:
+def _table(elements: Sequence[Element]) -> Table | None:
     for element in elements:
         if isinstance(element, Table):
-            return element.render_csv()
-    return ""
+            return element
+    return None
+
+
+def render_csv(elements: Sequence[Element]) -> str:
+    table = _table(elements)
+    return table.render_csv() if table is not None else ""
+
+
+def write_csv(elements: Sequence[Element], stream: TextIO) -> None:
+    table = _table(elements)
+    if table is not None:
+        table.write_csv(stream)
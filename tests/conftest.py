@@ -0,0 +1,143 @@
+import functools
+import io
+import json
+import pathlib
+import urllib.parse
+import zipfile
+from collections.abc import Callable, Iterator
+from typing import Any, cast
+
+import orjson
+import pytest
+import requests_mock
+
+from mrpack_utils.mods import GameVersion, Modpack
+
+ModrinthAPI = tuple[dict[str, Any], list[dict[str, Any]]]
+
+
+@pytest.fixture(scope="session")
+def modrinth_api() -> ModrinthAPI:
+    """Modrinth's version_files and projects data for every mod in the test mrpacks."""
+    with open("testdata/modrinth-api.json", "rb") as f:
+        j = orjson.loads(f.read())
+    return j["version_files"], j["projects"]
+
+
+@pytest.fixture
+def fake_modrinth(monkeypatch: pytest.MonkeyPatch, modrinth_api: ModrinthAPI) -> None:
+    """Serve Modrinth API lookups from modrinth_api, without going through HTTP."""
+    versions, projects = modrinth_api
+    monkeypatch.setattr(
+        Modpack,
+        "_fetch_version_batch",
+        lambda hashes: {h: versions[h] for h in hashes if h in versions},
+    )
+    monkeypatch.setattr(
+        Modpack,
+        "_fetch_project_batch",
+        lambda ids: [project for project in projects if project["id"] in ids],
+    )
+
+
+def project_ids(request: Any) -> list[str]:  # noqa: ANN401
+    return cast(
+        list[str],
+        json.loads(urllib.parse.parse_qs(urllib.parse.urlsplit(request.url).query)["ids"][0]),
+    )
+
+
+@pytest.fixture(scope="class")
+def modrinth_http(modrinth_api: ModrinthAPI) -> Iterator[requests_mock.Mocker]:
+    """Serve modrinth_api over mocked HTTP, for tests that go through the real client."""
+    versions, projects = modrinth_api
+
+    def version_files(request: Any, _: Any) -> dict[str, Any]:  # noqa: ANN401
+        return {h: versions[h] for h in request.json()["hashes"] if h in versions}
+
+    def get_projects(request: Any, _: Any) -> list[dict[str, Any]]:  # noqa: ANN401
+        ids = project_ids(request)
+        return [project for project in projects if project["id"] in ids]
+
+    with requests_mock.Mocker() as m:
+        m.post("https://api.modrinth.com/v2/version_files", json=version_files)
+        m.get("https://api.modrinth.com/v2/projects", json=get_projects)
+        yield m
+
+
+@pytest.fixture
+def modrinth_requests(
+    modrinth_http: requests_mock.Mocker,
+) -> Callable[[], tuple[list[str], list[str]]]:
+    """Report the hashes and project ids this test has requested from modrinth_http so far."""
+    modrinth_http.reset_mock()
+
+    def requested() -> tuple[list[str], list[str]]:
+        hashes = []
+        ids = []
+        for request in modrinth_http.request_history:
+            if request.method == "POST":
+                hashes.extend(request.json()["hashes"])
+            else:
+                ids.extend(project_ids(request))
+        return sorted(hashes), sorted(ids)
+
+    return requested
+
+
+def make_modpack(name: str, game_version: str, **overrides: Any) -> Modpack:  # noqa: ANN401
+    fields: dict[str, Any] = {
+        "name": name,
+        "version": "1",
+        "game_version": GameVersion(game_version),
+        "dependencies": {},
+        "mods": {},
+        "missing_mods": frozenset(),
+        "unknown_mods": {},
+        "other_files": {},
+    }
+    return Modpack(**(fields | overrides))
+
+
+def _build_mrpack(directory: str) -> bytes:
+    with io.BytesIO() as f:
+        with zipfile.ZipFile(f, "w") as z:
+            for path in sorted(pathlib.Path(directory).rglob("*")):
+                if path.is_file():
+                    z.write(path, path.relative_to(directory).as_posix())
+        return f.getvalue()
+
+
+@pytest.fixture(scope="session")
+def test1_mrpack() -> bytes:
+    return _build_mrpack("testdata/test1")
+
+
+@pytest.fixture(scope="session")
+def test2_mrpack() -> bytes:
+    return _build_mrpack("testdata/test2")
+
+
+@pytest.fixture(scope="session")
+def test1_mrpack_path(test1_mrpack: bytes, tmp_path_factory: pytest.TempPathFactory) -> str:
+    path = tmp_path_factory.mktemp("mrpack") / "test1.mrpack"
+    path.write_bytes(test1_mrpack)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def test2_mrpack_path(test2_mrpack: bytes, tmp_path_factory: pytest.TempPathFactory) -> str:
+    path = tmp_path_factory.mktemp("mrpack") / "test2.mrpack"
+    path.write_bytes(test2_mrpack)
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def golden() -> Callable[[str], str]:
+    """Expected command output, read from testdata/golden once per file."""
+
+    @functools.cache
+    def read(name: str) -> str:
+        return pathlib.Path("testdata/golden", name).read_text()
+
+    return read
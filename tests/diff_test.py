@@ -1,4 +1,7 @@
-import requests_mock
+import io
+from collections.abc import Callable
+
+import pytest
 
 from mrpack_utils.commands.diff import (
     _diff,
@@ -10,325 +13,135 @@ from mrpack_utils.commands.diff import (
 )
 from mrpack_utils.mods import Env, GameVersion, Mod, Modpack, Requirement
 from mrpack_utils.output import MissingMods, Table
+from tests.conftest import make_modpack
+
+_Diff = tuple[tuple[str, str, str], ...]
+
+_EXPECTED_DIFF = (
+    ("b", "1", "2"),
+    ("C", "1", "2"),
+    ("f", "", "1"),
+    ("G", "", "1"),
+    ("d", "1", ""),
+    ("E", "1", ""),
+)
+
+_EXPECTED_RUN = (
+    Table(
+        (
+            ("Name", "Old", "New"),
+            ("modpack version", "1.1", "1.2"),
+            ("fabric-loader", "0.16", "0.17"),
+            ("foo", "1", "2"),
+            ("Foo", "1.2.3", "1.2.4"),
+            ("Quux", "", "1.0.0"),
+            ("Bar", "4.5.6", ""),
+            ("client-overrides/mods/baz-1.0.0.jar", "a2c6f513", "d59e8961"),
+            ("overrides/mods/foo-1.2.4.jar", "", "99d1bc3b"),
+            ("overrides/mods/foo-1.2.3.jar", "d6902afc", ""),
+            ("server-overrides/config/bar.txt", "04a2b3e9", "a472c297"),
+            ("overrides/config/baz.txt", "", "cc7b39e1"),
+            ("overrides/config/foo.txt", "7e3265a8", ""),
+        ),
+    ),
+    MissingMods(frozenset({"baz.jar"})),
+)
+
+_ENV = Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED)
+_GAME_VERSIONS = frozenset({GameVersion("1.19.2")})
+
+
+def _mod(name: str, version: str) -> Mod:
+    return Mod(
+        name=name,
+        slug=name,
+        version=version,
+        original_env=_ENV,
+        overridden_env=_ENV,
+        mod_license="",
+        source_url="",
+        issues_url="",
+        game_versions=_GAME_VERSIONS,
+    )
 
 
 class TestDiff:
     def test_diff(self) -> None:
-        assert _diff({}, {}) == []
-        assert _diff(
-            {
-                "A": "1",
-                "b": "1",
-                "C": "1",
-                "d": "1",
-                "E": "1",
-            },
-            {
-                "A": "1",
-                "b": "2",
-                "C": "2",
-                "f": "1",
-                "G": "1",
-            },
-        ) == [
-            ("b", "1", "2"),
-            ("C", "1", "2"),
-            ("f", "", "1"),
-            ("G", "", "1"),
-            ("d", "1", ""),
-            ("E", "1", ""),
-        ]
+        assert _diff({}, {}) == ()
+        assert (
+            _diff(
+                {
+                    "A": "1",
+                    "b": "1",
+                    "C": "1",
+                    "d": "1",
+                    "E": "1",
+                },
+                {
+                    "A": "1",
+                    "b": "2",
+                    "C": "2",
+                    "f": "1",
+                    "G": "1",
+                },
+            )
+            == _EXPECTED_DIFF
+        )
 
     def test_modpack_data(self) -> None:
-        modpack1 = Modpack(
-            name="Test 1",
-            version="1",
-            game_version=GameVersion("1.19.2"),
-            dependencies={
-                "A": "1",
-                "B": "1",
-            },
-            mods={},
-            missing_mods=set(),
-            unknown_mods={},
-            other_files={},
-        )
-        modpack2 = Modpack(
-            name="Test 2",
+        modpack1 = make_modpack("Test 1", "1.19.2", dependencies={"A": "1", "B": "1"})
+        modpack2 = make_modpack(
+            "Test 2",
+            "1.19.4",
             version="2",
-            game_version=GameVersion("1.19.4"),
-            dependencies={
-                "A": "2",
-                "C": "1",
-            },
-            mods={},
-            missing_mods=set(),
-            unknown_mods={},
-            other_files={},
+            dependencies={"A": "2", "C": "1"},
         )
 
-        assert _modpack_data(modpack1, modpack1) == []
-        assert _modpack_data(modpack1, modpack2) == [
+        assert _modpack_data(modpack1, modpack1) == ()
+        assert _modpack_data(modpack1, modpack2) == (
             ("modpack name", "Test 1", "Test 2"),
             ("modpack version", "1", "2"),
             ("minecraft", "1.19.2", "1.19.4"),
             ("A", "1", "2"),
             ("C", "", "1"),
             ("B", "1", ""),
-        ]
+        )
 
     def test_mods(self) -> None:
-        mod1_1 = Mod(
-            name="A",
-            slug="A",
-            version="1",
-            original_env=Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED),
-            overridden_env=Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED),
-            mod_license="",
-            source_url="",
-            issues_url="",
-            game_versions={GameVersion("1.19.2")},
-        )
-        mod1_2 = Mod(
-            name="A",
-            slug="A",
-            version="2",
-            original_env=Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED),
-            overridden_env=Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED),
-            mod_license="",
-            source_url="",
-            issues_url="",
-            game_versions={GameVersion("1.19.2")},
-        )
-        mod2 = Mod(
-            name="B",
-            slug="B",
-            version="1",
-            original_env=Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED),
-            overridden_env=Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED),
-            mod_license="",
-            source_url="",
-            issues_url="",
-            game_versions={GameVersion("1.19.2")},
-        )
-        mod3 = Mod(
-            name="C",
-            slug="C",
-            version="1",
-            original_env=Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED),
-            overridden_env=Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED),
-            mod_license="",
-            source_url="",
-            issues_url="",
-            game_versions={GameVersion("1.19.2")},
-        )
+        mod1_1 = _mod("A", "1")
+        mod1_2 = _mod("A", "2")
+        mod2 = _mod("B", "1")
+        mod3 = _mod("C", "1")
 
-        modpack1 = Modpack(
-            name="Test",
-            version="1",
-            game_version=GameVersion("1.19.2"),
-            dependencies={},
-            mods={"A": mod1_1, "B": mod2},
-            missing_mods=set(),
-            unknown_mods={},
-            other_files={},
-        )
-        modpack2 = Modpack(
-            name="Test",
-            version="2",
-            game_version=GameVersion("1.19.2"),
-            dependencies={},
-            mods={"A": mod1_2, "C": mod3},
-            missing_mods=set(),
-            unknown_mods={},
-            other_files={},
-        )
+        modpack1 = make_modpack("Test", "1.19.2", mods={"A": mod1_1, "B": mod2})
+        modpack2 = make_modpack("Test", "1.19.2", version="2", mods={"A": mod1_2, "C": mod3})
 
-        assert _mods(modpack1, modpack1) == []
-        assert _mods(modpack1, modpack2) == [
+        assert _mods(modpack1, modpack1) == ()
+        assert _mods(modpack1, modpack2) == (
             ("A", "1", "2"),
             ("C", "", "1"),
             ("B", "1", ""),
-        ]
-
-    def test_unknown_mods(self) -> None:
-        modpack1 = Modpack(
-            name="Test 1",
-            version="1",
-            game_version=GameVersion("1.19.2"),
-            dependencies={},
-            mods={},
-            missing_mods=set(),
-            unknown_mods={
-                "A": "1",
-                "B": "1",
-            },
-            other_files={},
-        )
-        modpack2 = Modpack(
-            name="Test 2",
-            version="2",
-            game_version=GameVersion("1.19.4"),
-            dependencies={},
-            mods={},
-            missing_mods=set(),
-            unknown_mods={
-                "A": "2",
-                "C": "1",
-            },
-            other_files={},
         )
 
-        assert _unknown_mods(modpack1, modpack1) == []
-        assert _unknown_mods(modpack1, modpack2) == [
-            ("A", "1", "2"),
-            ("C", "", "1"),
-            ("B", "1", ""),
-        ]
+    @pytest.mark.parametrize(
+        ("field", "diff"),
+        [("unknown_mods", _unknown_mods), ("other_files", _other_files)],
+    )
+    def test_files(self, field: str, diff: Callable[[Modpack, Modpack], _Diff]) -> None:
+        modpack1 = make_modpack("Test 1", "1.19.2", **{field: {"A": "1", "B": "1"}})
+        modpack2 = make_modpack("Test 2", "1.19.2", version="2", **{field: {"A": "2", "C": "1"}})
 
-    def test_other_files(self) -> None:
-        modpack1 = Modpack(
-            name="Test 1",
-            version="1",
-            game_version=GameVersion("1.19.2"),
-            dependencies={},
-            mods={},
-            missing_mods=set(),
-            unknown_mods={},
-            other_files={
-                "A": "1",
-                "B": "1",
-            },
-        )
-        modpack2 = Modpack(
-            name="Test 2",
-            version="2",
-            game_version=GameVersion("1.19.4"),
-            dependencies={},
-            mods={},
-            missing_mods=set(),
-            unknown_mods={},
-            other_files={
-                "A": "2",
-                "C": "1",
-            },
-        )
-
-        assert _other_files(modpack1, modpack1) == []
-        assert _other_files(modpack1, modpack2) == [
+        assert diff(modpack1, modpack1) == ()
+        assert diff(modpack1, modpack2) == (
             ("A", "1", "2"),
             ("C", "", "1"),
             ("B", "1", ""),
-        ]
-
-    def test_run(self) -> None:
-        with requests_mock.Mocker() as m:
-            m.post(
-                "https://api.modrinth.com/v2/version_files",
-                json={
-                    "abcd": {
-                        "project_id": "baz",
-                        "version_number": "1.2.3",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "abcd",
-                                },
-                            },
-                            {
-                                "hashes": {
-                                    "sha512": "wxyz",
-                                },
-                            },
-                        ],
-                    },
-                    "abcd2": {
-                        "project_id": "baz",
-                        "version_number": "1.2.4",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "abcd2",
-                                },
-                            },
-                            {
-                                "hashes": {
-                                    "sha512": "wxyz2",
-                                },
-                            },
-                        ],
-                    },
-                    "fedc": {
-                        "project_id": "quux",
-                        "version_number": "4.5.6",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "fedc",
-                                },
-                            },
-                        ],
-                    },
-                    "lmno": {
-                        "project_id": "blah",
-                        "version_number": "1.0.0",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "lmno",
-                                },
-                            },
-                        ],
-                    },
-                },
-            )
-            m.get(
-                'https://api.modrinth.com/v2/projects?ids=["baz", "blah", "quux"]',
-                complete_qs=True,
-                json=[
-                    {
-                        "id": "baz",
-                        "title": "Foo",
-                        "slug": "foo",
-                        "game_versions": ["1.19.2", "1.20"],
-                        "client_side": "optional",
-                        "server_side": "required",
-                        "license": {"id": "MIT"},
-                        "source_url": "example.com",
-                        "issues_url": "example2.com",
-                    },
-                    {
-                        "id": "blah",
-                        "title": "Quux",
-                        "slug": "quux",
-                        "game_versions": ["1.19.4"],
-                    },
-                    {
-                        "id": "quux",
-                        "title": "Bar",
-                        "slug": "bar",
-                        "game_versions": ["1.19.4"],
-                    },
-                ],
-            )
+        )
 
-            assert run("testdata/test1.mrpack", "testdata/test2.mrpack") == (
-                Table(
-                    [
-                        ("Name", "Old", "New"),
-                        ("modpack version", "1.1", "1.2"),
-                        ("fabric-loader", "0.16", "0.17"),
-                        ("foo", "1", "2"),
-                        ("Foo", "1.2.3", "1.2.4"),
-                        ("Quux", "", "1.0.0"),
-                        ("Bar", "4.5.6", ""),
-                        ("client-overrides/mods/baz-1.0.0.jar", "a2c6f513", "d59e8961"),
-                        ("overrides/mods/foo-1.2.4.jar", "", "99d1bc3b"),
-                        ("overrides/mods/foo-1.2.3.jar", "d6902afc", ""),
-                        ("server-overrides/config/bar.txt", "04a2b3e9", "a472c297"),
-                        ("overrides/config/baz.txt", "", "cc7b39e1"),
-                        ("overrides/config/foo.txt", "7e3265a8", ""),
-                    ],
-                ),
-                MissingMods({"baz.jar"}),
-            )
+    @pytest.mark.usefixtures("fake_modrinth")
+    def test_run(
+        self,
+        test1_mrpack: bytes,
+        test2_mrpack: bytes,
+    ) -> None:
+        assert run(io.BytesIO(test1_mrpack), io.BytesIO(test2_mrpack)) == _EXPECTED_RUN
@@ -1,4 +1,6 @@
-import requests_mock
+import io
+
+import pytest
 
 from mrpack_utils.commands.list import (
     _empty_row,
@@ -13,24 +15,380 @@ from mrpack_utils.mods import (
     Env,
     GameVersion,
     Mod,
-    Modpack,
     Requirement,
 )
 from mrpack_utils.output import IncompatibleMods, MissingMods, Table
+from tests.conftest import make_modpack
+
+_CHECK_119_120 = frozenset({GameVersion("1.19"), GameVersion("1.20")})
+_CHECK_1192 = frozenset({GameVersion("1.19.2")})
+_CHECK_1194_120 = frozenset({GameVersion("1.19.4"), GameVersion("1.20")})
+_CHECK_120 = frozenset({GameVersion("1.20")})
+
+_EXPECTED_TABLE_NORMAL = Table(
+    (
+        (
+            "Name",
+            "Link",
+            "Installed version",
+            "On client",
+            "On server",
+            "Latest game version",
+            "1.19.4",
+            "1.20",
+        ),
+        (
+            "modpack: Test Modpack",
+            "",
+            "1.1",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "minecraft",
+            "",
+            "1.19.4",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "fabric-loader",
+            "",
+            "0.16",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "foo",
+            "",
+            "1",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "Bar",
+            "https://modrinth.com/mod/bar",
+            "4.5.6",
+            "unknown",
+            "unknown",
+            "1.19.4",
+            "yes",
+            "no",
+        ),
+        (
+            "Foo",
+            "https://modrinth.com/mod/foo",
+            "1.2.3",
+            "required",
+            "optional",
+            "1.20",
+            "no",
+            "yes",
+        ),
+        (
+            "client-overrides/mods/baz-1.0.0.jar",
+            "unknown - probably CurseForge",
+            "a2c6f513",
+            "unknown",
+            "unknown",
+            "unknown",
+            "check manually",
+            "check manually",
+        ),
+        (
+            "client-overrides/mods/foo-1.2.3.jar",
+            "unknown - probably CurseForge",
+            "d6902afc",
+            "unknown",
+            "unknown",
+            "unknown",
+            "check manually",
+            "check manually",
+        ),
+        (
+            "overrides/mods/foo-1.2.3.jar",
+            "unknown - probably CurseForge",
+            "d6902afc",
+            "unknown",
+            "unknown",
+            "unknown",
+            "check manually",
+            "check manually",
+        ),
+        (
+            "server-overrides/mods/bar-1.0.0.jar",
+            "unknown - probably CurseForge",
+            "7123eea6",
+            "unknown",
+            "unknown",
+            "unknown",
+            "check manually",
+            "check manually",
+        ),
+        (
+            "overrides/config/foo.txt",
+            "non-mod file",
+            "7e3265a8",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "server-overrides/config/bar.txt",
+            "non-mod file",
+            "04a2b3e9",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+    ),
+)
+
+_EXPECTED_TABLE_DEV = Table(
+    (
+        (
+            "Name",
+            "Link",
+            "Installed version",
+            "On client",
+            "On server",
+            "Latest game version",
+            "1.19.4",
+            "1.20",
+            "License",
+            "Modrinth client",
+            "Modrinth server",
+            "Source",
+            "Issues",
+        ),
+        (
+            "modpack: Test Modpack",
+            "",
+            "1.1",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "minecraft",
+            "",
+            "1.19.4",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "fabric-loader",
+            "",
+            "0.16",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "foo",
+            "",
+            "1",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "Bar",
+            "https://modrinth.com/mod/bar",
+            "4.5.6",
+            "unknown",
+            "unknown",
+            "1.19.4",
+            "yes",
+            "no",
+            "",
+            "unknown",
+            "unknown",
+            "",
+            "",
+        ),
+        (
+            "Foo",
+            "https://modrinth.com/mod/foo",
+            "1.2.3",
+            "required",
+            "optional",
+            "1.20",
+            "no",
+            "yes",
+            "MIT",
+            "optional",
+            "required",
+            "example.com",
+            "example2.com",
+        ),
+        (
+            "client-overrides/mods/baz-1.0.0.jar",
+            "unknown - probably CurseForge",
+            "a2c6f513",
+            "unknown",
+            "unknown",
+            "unknown",
+            "check manually",
+            "check manually",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "client-overrides/mods/foo-1.2.3.jar",
+            "unknown - probably CurseForge",
+            "d6902afc",
+            "unknown",
+            "unknown",
+            "unknown",
+            "check manually",
+            "check manually",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "overrides/mods/foo-1.2.3.jar",
+            "unknown - probably CurseForge",
+            "d6902afc",
+            "unknown",
+            "unknown",
+            "unknown",
+            "check manually",
+            "check manually",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "server-overrides/mods/bar-1.0.0.jar",
+            "unknown - probably CurseForge",
+            "7123eea6",
+            "unknown",
+            "unknown",
+            "unknown",
+            "check manually",
+            "check manually",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "overrides/config/foo.txt",
+            "non-mod file",
+            "7e3265a8",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+        (
+            "server-overrides/config/bar.txt",
+            "non-mod file",
+            "04a2b3e9",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+            "",
+        ),
+    ),
+)
+
+_EXPECTED_RUN_MODS = (
+    MissingMods(frozenset({"baz.jar"})),
+    IncompatibleMods(
+        num_mods=2,
+        game_version="1.19.4",
+        mods=frozenset({"Foo"}),
+        curseforge_warning=True,
+    ),
+    IncompatibleMods(
+        num_mods=2,
+        game_version="1.20",
+        mods=frozenset({"Bar"}),
+        curseforge_warning=True,
+    ),
+)
 
 
 class TestList:
     def test_headers(self) -> None:
-        assert _headers(set(), False) == [
+        assert _headers(frozenset(), False) == (
             "Name",
             "Link",
             "Installed version",
             "On client",
             "On server",
             "Latest game version",
-        ]
+        )
 
-        assert _headers({GameVersion("1.20"), GameVersion("1.19")}, False) == [
+        assert _headers(_CHECK_119_120, False) == (
             "Name",
             "Link",
             "Installed version",
@@ -39,9 +397,9 @@ class TestList:
             "Latest game version",
             "1.19",
             "1.20",
-        ]
+        )
 
-        assert _headers(set(), True) == [
+        assert _headers(frozenset(), True) == (
             "Name",
             "Link",
             "Installed version",
@@ -53,9 +411,9 @@ class TestList:
             "Modrinth server",
             "Source",
             "Issues",
-        ]
+        )
 
-        assert _headers({GameVersion("1.20"), GameVersion("1.19")}, True) == [
+        assert _headers(_CHECK_119_120, True) == (
             "Name",
             "Link",
             "Installed version",
@@ -69,23 +427,18 @@ class TestList:
             "Modrinth server",
             "Source",
             "Issues",
-        ]
+        )
 
     def test_empty_row(self) -> None:
-        assert _empty_row(["a", "b", "c"]) == ["", "", ""]
+        assert _empty_row(["a", "b", "c"]) == ("", "", "")
 
     def test_modpack_data(self) -> None:
-        modpack = Modpack(
-            name="Test Modpack",
-            version="1",
-            game_version=GameVersion("1.19.4"),
+        modpack = make_modpack(
+            "Test Modpack",
+            "1.19.4",
             dependencies={"Foo": "1", "fabric-loader": "0.16"},
-            mods={},
-            missing_mods=set(),
-            unknown_mods={},
-            other_files={},
         )
-        assert _modpack_data(modpack, _headers({GameVersion("1.19.2")}, False)) == [
+        assert _modpack_data(modpack, _headers(_CHECK_1192, False)) == [
             ["modpack: Test Modpack", "", "1", "", "", "", ""],
             ["minecraft", "", "1.19.4", "", "", "", ""],
             ["fabric-loader", "", "0.16", "", "", "", ""],
@@ -102,7 +455,7 @@ class TestList:
             mod_license="MIT",
             source_url="example.com",
             issues_url="example2.com",
-            game_versions=frozenset([GameVersion("1.20"), GameVersion("1.19.4")]),
+            game_versions=frozenset({GameVersion("1.20"), GameVersion("1.19.4")}),
         )
         bar = Mod(
             name="Bar",
@@ -113,22 +466,18 @@ class TestList:
             mod_license="GPL",
             source_url="",
             issues_url="",
-            game_versions=frozenset([GameVersion("1.19.4"), GameVersion("1.19.2")]),
+            game_versions=frozenset({GameVersion("1.19.4"), GameVersion("1.19.2")}),
         )
-        modpack = Modpack(
-            name="Test Modpack",
-            version="1",
-            game_version=GameVersion("1.19.4"),
+        modpack = make_modpack(
+            "Test Modpack",
+            "1.19.4",
             dependencies={"foo": "1", "fabric-loader": "0.16"},
             mods={"abcd": foo, "fedc": bar},
-            missing_mods=frozenset(),
-            unknown_mods={},
-            other_files={},
         )
 
         mods, incompatible = _mods(
             modpack,
-            frozenset([GameVersion("1.19.4"), GameVersion("1.20")]),
+            _CHECK_1194_120,
             False,
         )
         assert mods == [
@@ -155,12 +504,12 @@ class TestList:
         ]
         assert incompatible == {
             GameVersion("1.19.4"): frozenset(),
-            GameVersion("1.20"): frozenset([bar]),
+            GameVersion("1.20"): frozenset({bar}),
         }
 
         mods, incompatible = _mods(
             modpack,
-            frozenset([GameVersion("1.19.4"), GameVersion("1.20")]),
+            _CHECK_1194_120,
             True,
         )
         assert mods == [
@@ -197,20 +546,11 @@ class TestList:
         ]
         assert incompatible == {
             GameVersion("1.19.4"): frozenset(),
-            GameVersion("1.20"): frozenset([bar]),
+            GameVersion("1.20"): frozenset({bar}),
         }
 
     def test_unknown_mods(self) -> None:
-        modpack = Modpack(
-            name="Test Modpack",
-            version="1",
-            game_version=GameVersion("1.19.4"),
-            dependencies={},
-            mods={},
-            missing_mods=set(),
-            unknown_mods={"Foo": "a", "bar": "b"},
-            other_files={},
-        )
+        modpack = make_modpack("Test Modpack", "1.19.4", unknown_mods={"Foo": "a", "bar": "b"})
 
         assert _unknown_mods(modpack, {GameVersion("1.19.2")}, False) == [
             [
@@ -265,500 +605,22 @@ class TestList:
         ]
 
     def test_other_files(self) -> None:
-        modpack = Modpack(
-            name="Test Modpack",
-            version="1",
-            game_version=GameVersion("1.19.4"),
-            dependencies={},
-            mods={},
-            missing_mods=set(),
-            unknown_mods={},
-            other_files={"Foo": "a", "bar": "b"},
-        )
-        assert _other_files(modpack, _headers({GameVersion("1.19.2")}, False)) == [
+        modpack = make_modpack("Test Modpack", "1.19.4", other_files={"Foo": "a", "bar": "b"})
+        assert _other_files(modpack, _headers(_CHECK_1192, False)) == [
             ["bar", "non-mod file", "b", "", "", "", ""],
             ["Foo", "non-mod file", "a", "", "", "", ""],
         ]
 
-    def test_run_normal(self) -> None:
-        with requests_mock.Mocker() as m:
-            m.post(
-                "https://api.modrinth.com/v2/version_files",
-                json={
-                    "abcd": {
-                        "project_id": "baz",
-                        "version_number": "1.2.3",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "abcd",
-                                },
-                            },
-                            {
-                                "hashes": {
-                                    "sha512": "wxyz",
-                                },
-                            },
-                        ],
-                    },
-                    "fedc": {
-                        "project_id": "quux",
-                        "version_number": "4.5.6",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "fedc",
-                                },
-                            },
-                        ],
-                    },
-                },
-            )
-            m.get(
-                'https://api.modrinth.com/v2/projects?ids=["baz", "quux"]',
-                complete_qs=True,
-                json=[
-                    {
-                        "id": "baz",
-                        "title": "Foo",
-                        "slug": "foo",
-                        "game_versions": ["1.19.2", "1.20"],
-                        "client_side": "optional",
-                        "server_side": "required",
-                        "license": {"id": "MIT"},
-                        "source_url": "example.com",
-                        "issues_url": "example2.com",
-                    },
-                    {
-                        "id": "quux",
-                        "title": "Bar",
-                        "slug": "bar",
-                        "game_versions": ["1.19.4"],
-                    },
-                ],
-            )
-            assert run("testdata/test1.mrpack", frozenset([GameVersion("1.20")]), False) == (
-                Table(
-                    [
-                        [
-                            "Name",
-                            "Link",
-                            "Installed version",
-                            "On client",
-                            "On server",
-                            "Latest game version",
-                            "1.19.4",
-                            "1.20",
-                        ],
-                        [
-                            "modpack: Test Modpack",
-                            "",
-                            "1.1",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "minecraft",
-                            "",
-                            "1.19.4",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "fabric-loader",
-                            "",
-                            "0.16",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "foo",
-                            "",
-                            "1",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "Bar",
-                            "https://modrinth.com/mod/bar",
-                            "4.5.6",
-                            "unknown",
-                            "unknown",
-                            "1.19.4",
-                            "yes",
-                            "no",
-                        ],
-                        [
-                            "Foo",
-                            "https://modrinth.com/mod/foo",
-                            "1.2.3",
-                            "required",
-                            "optional",
-                            "1.20",
-                            "no",
-                            "yes",
-                        ],
-                        [
-                            "client-overrides/mods/baz-1.0.0.jar",
-                            "unknown - probably CurseForge",
-                            "a2c6f513",
-                            "unknown",
-                            "unknown",
-                            "unknown",
-                            "check manually",
-                            "check manually",
-                        ],
-                        [
-                            "client-overrides/mods/foo-1.2.3.jar",
-                            "unknown - probably CurseForge",
-                            "d6902afc",
-                            "unknown",
-                            "unknown",
-                            "unknown",
-                            "check manually",
-                            "check manually",
-                        ],
-                        [
-                            "overrides/mods/foo-1.2.3.jar",
-                            "unknown - probably CurseForge",
-                            "d6902afc",
-                            "unknown",
-                            "unknown",
-                            "unknown",
-                            "check manually",
-                            "check manually",
-                        ],
-                        [
-                            "server-overrides/mods/bar-1.0.0.jar",
-                            "unknown - probably CurseForge",
-                            "7123eea6",
-                            "unknown",
-                            "unknown",
-                            "unknown",
-                            "check manually",
-                            "check manually",
-                        ],
-                        [
-                            "overrides/config/foo.txt",
-                            "non-mod file",
-                            "7e3265a8",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "server-overrides/config/bar.txt",
-                            "non-mod file",
-                            "04a2b3e9",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                    ],
-                ),
-                MissingMods(
-                    {"baz.jar"},
-                ),
-                IncompatibleMods(
-                    num_mods=2,
-                    game_version="1.19.4",
-                    mods={"Foo"},
-                    curseforge_warning=True,
-                ),
-                IncompatibleMods(
-                    num_mods=2,
-                    game_version="1.20",
-                    mods={"Bar"},
-                    curseforge_warning=True,
-                ),
-            )
+    @pytest.mark.usefixtures("fake_modrinth")
+    def test_run_normal(self, test1_mrpack: bytes) -> None:
+        assert run(io.BytesIO(test1_mrpack), _CHECK_120, False) == (
+            _EXPECTED_TABLE_NORMAL,
+            *_EXPECTED_RUN_MODS,
+        )
 
-    def test_run_dev(self) -> None:
-        with requests_mock.Mocker() as m:
-            m.post(
-                "https://api.modrinth.com/v2/version_files",
-                json={
-                    "abcd": {
-                        "project_id": "baz",
-                        "version_number": "1.2.3",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "abcd",
-                                },
-                            },
-                            {
-                                "hashes": {
-                                    "sha512": "wxyz",
-                                },
-                            },
-                        ],
-                    },
-                    "fedc": {
-                        "project_id": "quux",
-                        "version_number": "4.5.6",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "fedc",
-                                },
-                            },
-                        ],
-                    },
-                },
-            )
-            m.get(
-                'https://api.modrinth.com/v2/projects?ids=["baz", "quux"]',
-                complete_qs=True,
-                json=[
-                    {
-                        "id": "baz",
-                        "title": "Foo",
-                        "slug": "foo",
-                        "game_versions": ["1.19.2", "1.20"],
-                        "client_side": "optional",
-                        "server_side": "required",
-                        "license": {"id": "MIT"},
-                        "source_url": "example.com",
-                        "issues_url": "example2.com",
-                    },
-                    {
-                        "id": "quux",
-                        "title": "Bar",
-                        "slug": "bar",
-                        "game_versions": ["1.19.4"],
-                    },
-                ],
-            )
-            assert run("testdata/test1.mrpack", frozenset([GameVersion("1.20")]), True) == (
-                Table(
-                    [
-                        [
-                            "Name",
-                            "Link",
-                            "Installed version",
-                            "On client",
-                            "On server",
-                            "Latest game version",
-                            "1.19.4",
-                            "1.20",
-                            "License",
-                            "Modrinth client",
-                            "Modrinth server",
-                            "Source",
-                            "Issues",
-                        ],
-                        [
-                            "modpack: Test Modpack",
-                            "",
-                            "1.1",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "minecraft",
-                            "",
-                            "1.19.4",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "fabric-loader",
-                            "",
-                            "0.16",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "foo",
-                            "",
-                            "1",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "Bar",
-                            "https://modrinth.com/mod/bar",
-                            "4.5.6",
-                            "unknown",
-                            "unknown",
-                            "1.19.4",
-                            "yes",
-                            "no",
-                            "",
-                            "unknown",
-                            "unknown",
-                            "",
-                            "",
-                        ],
-                        [
-                            "Foo",
-                            "https://modrinth.com/mod/foo",
-                            "1.2.3",
-                            "required",
-                            "optional",
-                            "1.20",
-                            "no",
-                            "yes",
-                            "MIT",
-                            "optional",
-                            "required",
-                            "example.com",
-                            "example2.com",
-                        ],
-                        [
-                            "client-overrides/mods/baz-1.0.0.jar",
-                            "unknown - probably CurseForge",
-                            "a2c6f513",
-                            "unknown",
-                            "unknown",
-                            "unknown",
-                            "check manually",
-                            "check manually",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "client-overrides/mods/foo-1.2.3.jar",
-                            "unknown - probably CurseForge",
-                            "d6902afc",
-                            "unknown",
-                            "unknown",
-                            "unknown",
-                            "check manually",
-                            "check manually",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "overrides/mods/foo-1.2.3.jar",
-                            "unknown - probably CurseForge",
-                            "d6902afc",
-                            "unknown",
-                            "unknown",
-                            "unknown",
-                            "check manually",
-                            "check manually",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "server-overrides/mods/bar-1.0.0.jar",
-                            "unknown - probably CurseForge",
-                            "7123eea6",
-                            "unknown",
-                            "unknown",
-                            "unknown",
-                            "check manually",
-                            "check manually",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "overrides/config/foo.txt",
-                            "non-mod file",
-                            "7e3265a8",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                        [
-                            "server-overrides/config/bar.txt",
-                            "non-mod file",
-                            "04a2b3e9",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                            "",
-                        ],
-                    ],
-                ),
-                MissingMods(
-                    {"baz.jar"},
-                ),
-                IncompatibleMods(
-                    num_mods=2,
-                    game_version="1.19.4",
-                    mods={"Foo"},
-                    curseforge_warning=True,
-                ),
-                IncompatibleMods(
-                    num_mods=2,
-                    game_version="1.20",
-                    mods={"Bar"},
-                    curseforge_warning=True,
-                ),
-            )
+    @pytest.mark.usefixtures("fake_modrinth")
+    def test_run_dev(self, test1_mrpack: bytes) -> None:
+        assert run(io.BytesIO(test1_mrpack), _CHECK_120, True) == (
+            _EXPECTED_TABLE_DEV,
+            *_EXPECTED_RUN_MODS,
+        )
@@ -1,34 +1,77 @@
+import copy
+import io
+import operator
+import pathlib
+import pickle
+from collections.abc import Callable
+from typing import Any
+
 import pytest
 import requests_mock
 from frozendict import frozendict
 
+import mrpack_utils.mods
 from mrpack_utils.mods import (
+    _MOD_OVERRIDE_DIRS,
     Env,
     GameVersion,
     Mod,
     Modpack,
     ModpackError,
     Requirement,
+    _is_override_mod,
     _MrpackFile,
 )
+from tests.conftest import project_ids
+
+_ENV_REQUIRED_OPTIONAL = Env(client=Requirement.REQUIRED, server=Requirement.OPTIONAL)
+_ENV_REQUIRED = Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED)
+_ENV_OPTIONAL = Env(client=Requirement.OPTIONAL, server=Requirement.OPTIONAL)
+_ENV_OPTIONAL_REQUIRED = Env(client=Requirement.OPTIONAL, server=Requirement.REQUIRED)
+_ENV_UNKNOWN = Env(client=Requirement.UNKNOWN, server=Requirement.UNKNOWN)
+
+
+def _projects_query(*ids: str) -> Callable[[Any], bool]:
+    """Match a projects request for exactly these ids, in any order."""
+
+    def match(request: Any) -> bool:  # noqa: ANN401
+        return set(project_ids(request)) == set(ids)
+
+    return match
 
 
 class TestRequirement:
-    def test_from_str(self) -> None:
-        assert Requirement.from_str("") == Requirement.UNKNOWN
-        assert Requirement.from_str("unknown") == Requirement.UNKNOWN
-        assert Requirement.from_str("required") == Requirement.REQUIRED
-        assert Requirement.from_str("optional") == Requirement.OPTIONAL
-        assert Requirement.from_str("unsupported") == Requirement.UNSUPPORTED
+    @pytest.mark.parametrize(
+        ("s", "expected"),
+        [
+            ("", Requirement.UNKNOWN),
+            (None, Requirement.UNKNOWN),
+            ("unknown", Requirement.UNKNOWN),
+            ("required", Requirement.REQUIRED),
+            ("optional", Requirement.OPTIONAL),
+            ("unsupported", Requirement.UNSUPPORTED),
+        ],
+    )
+    def test_from_str(self, s: str | None, expected: Requirement) -> None:
+        assert Requirement.from_str(s) == expected
+
+    def test_from_str_invalid(self) -> None:
         with pytest.raises(ValueError):
             Requirement.from_str("foo")
 
 
 class TestEnv:
+    def test_of(self) -> None:
+        e = Env.of(Requirement.REQUIRED, Requirement.OPTIONAL)
+        assert e == Env(client=Requirement.REQUIRED, server=Requirement.OPTIONAL)
+        assert e is Env.of(Requirement.REQUIRED, Requirement.OPTIONAL)
+        assert e != Env.of(Requirement.OPTIONAL, Requirement.REQUIRED)
+
     def test_from_dict(self) -> None:
         e = Env.from_dict({"client": "required", "server": "optional"})
         assert e.client == Requirement.REQUIRED
         assert e.server == Requirement.OPTIONAL
+        assert e is Env.from_dict({"client": "required", "server": "optional"})
 
         with pytest.raises(ValueError):
             Env.from_dict({"client": "required"})
@@ -37,18 +80,18 @@ class TestEnv:
 
 
 class TestGameVersion:
-    def test_version(self) -> None:
-        assert str(GameVersion("1.20.1")) == "1.20.1"
-        assert str(GameVersion("1.19")) == "1.19"
-        with pytest.raises(ValueError):
-            GameVersion("1")
-        with pytest.raises(ValueError):
-            GameVersion("a")
+    @pytest.mark.parametrize("version", ["1.20.1", "1.19"])
+    def test_version(self, version: str) -> None:
+        assert str(GameVersion(version)) == version
+
+    @pytest.mark.parametrize("version", ["1", "a", "19.2-dev"])
+    def test_version_invalid(self, version: str) -> None:
         with pytest.raises(ValueError):
-            GameVersion("19.2-dev")
+            GameVersion(version)
 
     def test_eq(self) -> None:
         assert GameVersion("1.19.4") == GameVersion("1.19.4")
+        assert GameVersion("1.19.4") is GameVersion("1.19.4")
         assert GameVersion("1.19.4") != GameVersion("1.20")
         with pytest.raises(NotImplementedError):
             assert GameVersion("1.20") == "1.20"
@@ -57,13 +100,33 @@ class TestGameVersion:
         assert hash(GameVersion("1.19.4")) == hash(GameVersion("1.19.4"))
         assert hash(GameVersion("1.19.4")) != hash(GameVersion("1.20"))
 
-    def test_lt(self) -> None:
-        assert GameVersion("1.19.4") < GameVersion("1.20")
-        assert GameVersion("1.2") < GameVersion("1.10")
-        assert GameVersion("1.20") < GameVersion("1.20.1")
-        assert GameVersion("1.20") > GameVersion("1.19.4")
+    def test_copy(self) -> None:
+        v = GameVersion("1.19.4")
+        assert copy.copy(v) is v
+        assert copy.deepcopy(v) is v
+        assert pickle.loads(pickle.dumps(v)) is v
+        assert copy.deepcopy({v: [v]}) == {v: [v]}
+
+    @pytest.mark.parametrize(
+        ("op", "a", "b"),
+        [
+            (operator.lt, "1.19.4", "1.20"),
+            (operator.lt, "1.2", "1.10"),
+            (operator.lt, "1.20", "1.20.1"),
+            (operator.gt, "1.20", "1.19.4"),
+            (operator.le, "1.20", "1.20"),
+            (operator.le, "1.20", "1.20.1"),
+            (operator.ge, "1.20", "1.20"),
+            (operator.ge, "1.20", "1.19.4"),
+        ],
+    )
+    def test_compare(self, op: Callable[[object, object], bool], a: str, b: str) -> None:
+        assert op(GameVersion(a), GameVersion(b))
+
+    @pytest.mark.parametrize("op", [operator.lt, operator.le, operator.gt, operator.ge])
+    def test_compare_invalid(self, op: Callable[[object, object], bool]) -> None:
         with pytest.raises(NotImplementedError):
-            assert GameVersion("1.20") < "1.20"
+            op(GameVersion("1.20"), "1.20")
 
     def test_from_list(self) -> None:
         assert GameVersion.from_list(["1.19", "1.20-dev", "1.18.4", "1.19", "foo"]) == frozenset(
@@ -72,8 +135,51 @@ class TestGameVersion:
 
 
 class TestMrpackFile:
-    def test_from_file(self) -> None:
-        m = _MrpackFile.from_file("testdata/test1.mrpack")
+    @pytest.mark.parametrize(
+        ("filename", "expected"),
+        [
+            ("overrides/mods/foo.jar", True),
+            ("client-overrides/mods/foo.jar", True),
+            ("server-overrides/mods/foo.jar", True),
+            ("./overrides/mods/foo.jar", True),
+            ("overrides//mods/foo.jar", True),
+            ("overrides/mods/./foo.jar", True),
+            ("overrides/mods/.jar", False),
+            ("overrides/mods/foo.txt", False),
+            ("overrides/mods/sub/foo.jar", False),
+            ("overrides/config/foo.jar", False),
+            ("/overrides/mods/foo.jar", False),
+            ("foo.jar", False),
+        ],
+    )
+    def test_is_override_mod(self, filename: str, expected: bool) -> None:
+        assert _is_override_mod(filename) == expected
+
+    @pytest.mark.parametrize(
+        "filename",
+        [
+            "",
+            ".",
+            "/",
+            "//overrides/mods/foo.jar",
+            "overrides/mods/",
+            "overrides/mods/foo.jar/",
+            "overrides/mods/foo.jar/.",
+            "overrides/./mods//foo.jar",
+            "overrides/mods/../mods/foo.jar",
+            "overrides/mods/..jar",
+            "overrides/mods/foo.jar.",
+            "overrides/mods/foo.JAR",
+            "mods/foo.jar",
+        ],
+    )
+    def test_is_override_mod_matches_pathlib(self, filename: str) -> None:
+        path = pathlib.PurePosixPath(filename)
+        expected = path.suffix == ".jar" and str(path.parent) in _MOD_OVERRIDE_DIRS
+        assert _is_override_mod(filename) == expected
+
+    def test_from_file(self, test1_mrpack_path: str) -> None:
+        m = _MrpackFile.from_file(test1_mrpack_path)
         assert m.name == "Test Modpack"
         assert m.version == "1.1"
         assert m.game_version == GameVersion("1.19.4")
@@ -82,7 +188,7 @@ class TestMrpackFile:
         assert m.mod_jars == frozendict({"abcd": "foo.jar", "fedc": "bar.jar", "pqrs": "baz.jar"})
         assert m.mod_envs == frozendict(
             {
-                "abcd": Env(client=Requirement.REQUIRED, server=Requirement.OPTIONAL),
+                "abcd": _ENV_REQUIRED_OPTIONAL,
             },
         )
         assert m.unknown_mods == frozendict(
@@ -110,8 +216,8 @@ class TestMod:
             name="Foo",
             slug="foo bar",
             version="1.2",
-            original_env=Env(client=Requirement.REQUIRED, server=Requirement.OPTIONAL),
-            overridden_env=Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED),
+            original_env=_ENV_REQUIRED_OPTIONAL,
+            overridden_env=_ENV_REQUIRED,
             mod_license="MIT",
             source_url="https://example.com/a b",
             issues_url="example2.com",
@@ -120,8 +226,8 @@ class TestMod:
         assert m.name == "Foo"
         assert m.link == "https://modrinth.com/mod/foo%20bar"
         assert m.version == "1.2"
-        assert m.original_env == Env(client=Requirement.REQUIRED, server=Requirement.OPTIONAL)
-        assert m.overridden_env == Env(client=Requirement.REQUIRED, server=Requirement.REQUIRED)
+        assert m.original_env == _ENV_REQUIRED_OPTIONAL
+        assert m.overridden_env == _ENV_REQUIRED
         assert m.mod_license == "MIT"
         assert m.source_url == "https://example.com/a%20b"
         assert m.issues_url == "example2.com"
@@ -133,7 +239,7 @@ class TestMod:
 
 
 class TestModpack:
-    def test_load(self) -> None:
+    def test_load(self, requests_mock: requests_mock.Mocker) -> None:
         mrpack1 = _MrpackFile(
             name="Test Modpack",
             version="1",
@@ -142,7 +248,7 @@ class TestModpack:
             mod_hashes=frozenset(["abcd", "fedc", "pqrs"]),
             mod_jars=frozendict({"abcd": "foo.jar", "fedc": "bar.jar", "pqrs": "baz.jar"}),
             mod_envs=frozendict(
-                {"abcd": Env(client=Requirement.REQUIRED, server=Requirement.OPTIONAL)},
+                {"abcd": _ENV_REQUIRED_OPTIONAL},
             ),
             unknown_mods=frozendict({"overrides/mods/unknown.jar": "a"}),
             other_files=frozendict({"overrides/config/foo.txt": "b"}),
@@ -155,80 +261,79 @@ class TestModpack:
             mod_hashes=frozenset(["abcd", "lmno", "pqrs"]),
             mod_jars=frozendict({"abcd": "foo.jar", "lmno": "bar.jar", "pqrs": "baz.jar"}),
             mod_envs=frozendict(
-                {"abcd": Env(client=Requirement.REQUIRED, server=Requirement.OPTIONAL)},
+                {"abcd": _ENV_REQUIRED_OPTIONAL},
             ),
             unknown_mods=frozendict({"overrides/mods/unknown.jar": "c"}),
             other_files=frozendict({"overrides/config/foo.txt": "d"}),
         )
 
-        with requests_mock.Mocker() as m:
-            m.post(
-                "https://api.modrinth.com/v2/version_files",
-                json={
-                    "abcd": {
-                        "project_id": "baz",
-                        "version_number": "1.2.3",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "abcd",
-                                },
+        requests_mock.post(
+            "https://api.modrinth.com/v2/version_files",
+            json={
+                "abcd": {
+                    "project_id": "baz",
+                    "version_number": "1.2.3",
+                    "files": [
+                        {
+                            "hashes": {
+                                "sha512": "abcd",
                             },
-                            {
-                                "hashes": {
-                                    "sha512": "wxyz",
-                                },
+                        },
+                        {
+                            "hashes": {
+                                "sha512": "wxyz",
                             },
-                        ],
-                    },
-                    "fedc": {
-                        "project_id": "quux",
-                        "version_number": "4.5.6",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "fedc",
-                                },
+                        },
+                    ],
+                },
+                "fedc": {
+                    "project_id": "quux",
+                    "version_number": "4.5.6",
+                    "files": [
+                        {
+                            "hashes": {
+                                "sha512": "fedc",
                             },
-                        ],
-                    },
-                    "lmno": {
-                        "project_id": "quux",
-                        "version_number": "4.5.7",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "lmno",
-                                },
+                        },
+                    ],
+                },
+                "lmno": {
+                    "project_id": "quux",
+                    "version_number": "4.5.7",
+                    "files": [
+                        {
+                            "hashes": {
+                                "sha512": "lmno",
                             },
-                        ],
-                    },
+                        },
+                    ],
+                },
+            },
+        )
+        requests_mock.get(
+            "https://api.modrinth.com/v2/projects",
+            additional_matcher=_projects_query("baz", "quux"),
+            json=[
+                {
+                    "id": "baz",
+                    "title": "Foo",
+                    "slug": "foo",
+                    "game_versions": ["1.19.2", "1.20"],
+                },
+                {
+                    "id": "quux",
+                    "title": "Bar",
+                    "slug": "bar",
+                    "game_versions": ["1.19.4"],
+                    "client_side": "optional",
+                    "server_side": "optional",
+                    "license": {"id": "MIT"},
+                    "source_url": "example.com",
+                    "issues_url": "example2.com",
                 },
-            )
-            m.get(
-                'https://api.modrinth.com/v2/projects?ids=["baz", "quux"]',
-                complete_qs=True,
-                json=[
-                    {
-                        "id": "baz",
-                        "title": "Foo",
-                        "slug": "foo",
-                        "game_versions": ["1.19.2", "1.20"],
-                    },
-                    {
-                        "id": "quux",
-                        "title": "Bar",
-                        "slug": "bar",
-                        "game_versions": ["1.19.4"],
-                        "client_side": "optional",
-                        "server_side": "optional",
-                        "license": {"id": "MIT"},
-                        "source_url": "example.com",
-                        "issues_url": "example2.com",
-                    },
-                ],
-            )
-            modpacks = Modpack._load(mrpack1, mrpack2)  # noqa: SLF001
+            ],
+        )
+        modpacks = Modpack._load(mrpack1, mrpack2)  # noqa: SLF001
 
         assert len(modpacks) == 2  # noqa: PLR2004
 
@@ -243,14 +348,8 @@ class TestModpack:
         assert mods[0].name == "Bar"
         assert mods[0].link == "https://modrinth.com/mod/bar"
         assert mods[0].version == "4.5.6"
-        assert mods[0].original_env == Env(
-            client=Requirement.OPTIONAL,
-            server=Requirement.OPTIONAL,
-        )
-        assert mods[0].overridden_env == Env(
-            client=Requirement.OPTIONAL,
-            server=Requirement.OPTIONAL,
-        )
+        assert mods[0].original_env == _ENV_OPTIONAL
+        assert mods[0].overridden_env == _ENV_OPTIONAL
         assert mods[0].mod_license == "MIT"
         assert mods[0].source_url == "example.com"
         assert mods[0].issues_url == "example2.com"
@@ -260,14 +359,8 @@ class TestModpack:
         assert mods[1].name == "Foo"
         assert mods[1].link == "https://modrinth.com/mod/foo"
         assert mods[1].version == "1.2.3"
-        assert mods[1].original_env == Env(
-            client=Requirement.UNKNOWN,
-            server=Requirement.UNKNOWN,
-        )
-        assert mods[1].overridden_env == Env(
-            client=Requirement.REQUIRED,
-            server=Requirement.OPTIONAL,
-        )
+        assert mods[1].original_env == _ENV_UNKNOWN
+        assert mods[1].overridden_env == _ENV_REQUIRED_OPTIONAL
         assert mods[1].mod_license == ""
         assert mods[1].source_url == ""
         assert mods[1].issues_url == ""
@@ -289,14 +382,8 @@ class TestModpack:
         assert mods[0].name == "Bar"
         assert mods[0].link == "https://modrinth.com/mod/bar"
         assert mods[0].version == "4.5.7"
-        assert mods[0].original_env == Env(
-            client=Requirement.OPTIONAL,
-            server=Requirement.OPTIONAL,
-        )
-        assert mods[0].overridden_env == Env(
-            client=Requirement.OPTIONAL,
-            server=Requirement.OPTIONAL,
-        )
+        assert mods[0].original_env == _ENV_OPTIONAL
+        assert mods[0].overridden_env == _ENV_OPTIONAL
         assert mods[0].mod_license == "MIT"
         assert mods[0].source_url == "example.com"
         assert mods[0].issues_url == "example2.com"
@@ -306,14 +393,8 @@ class TestModpack:
         assert mods[1].name == "Foo"
         assert mods[1].link == "https://modrinth.com/mod/foo"
         assert mods[1].version == "1.2.3"
-        assert mods[1].original_env == Env(
-            client=Requirement.UNKNOWN,
-            server=Requirement.UNKNOWN,
-        )
-        assert mods[1].overridden_env == Env(
-            client=Requirement.REQUIRED,
-            server=Requirement.OPTIONAL,
-        )
+        assert mods[1].original_env == _ENV_UNKNOWN
+        assert mods[1].overridden_env == _ENV_REQUIRED_OPTIONAL
         assert mods[1].mod_license == ""
         assert mods[1].source_url == ""
         assert mods[1].issues_url == ""
@@ -324,59 +405,50 @@ class TestModpack:
         assert modpack.unknown_mods == frozendict({"overrides/mods/unknown.jar": "c"})
         assert modpack.other_files == frozendict({"overrides/config/foo.txt": "d"})
 
-    def test_from_files(self) -> None:
-        with requests_mock.Mocker() as m:
-            m.post(
-                "https://api.modrinth.com/v2/version_files",
-                json={
-                    "abcd": {
-                        "project_id": "foo",
-                        "version_number": "1.2.3",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "abcd",
-                                },
-                            },
-                        ],
-                    },
-                    "fedc": {
-                        "project_id": "bar",
-                        "version_number": "4.5.6",
-                        "files": [
-                            {
-                                "hashes": {
-                                    "sha512": "fedc",
-                                },
-                            },
-                        ],
-                    },
+    def test_fetch_batched(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        requests_mock: requests_mock.Mocker,
+    ) -> None:
+        monkeypatch.setattr(mrpack_utils.mods, "_BATCH_SIZE", 1)
+
+        def version_files(request: Any, _: Any) -> dict[str, Any]:  # noqa: ANN401
+            (mod_hash,) = request.json()["hashes"]
+            return {
+                mod_hash: {
+                    "project_id": mod_hash.upper(),
+                    "files": [{"hashes": {"sha512": mod_hash}}],
                 },
-            )
-            m.get(
-                'https://api.modrinth.com/v2/projects?ids=["bar", "foo"]',
-                complete_qs=True,
-                json=[
-                    {
-                        "id": "foo",
-                        "title": "Foo",
-                        "slug": "foo",
-                        "game_versions": ["1.19.2", "1.20"],
-                    },
-                    {
-                        "id": "bar",
-                        "title": "Bar",
-                        "slug": "bar",
-                        "game_versions": ["1.19.4"],
-                        "client_side": "optional",
-                        "server_side": "optional",
-                        "license": {"id": "MIT"},
-                        "source_url": "example.com",
-                        "issues_url": "example2.com",
-                    },
-                ],
-            )
-            (modpack,) = Modpack.from_files("testdata/test1.mrpack")
+            }
+
+        requests_mock.post("https://api.modrinth.com/v2/version_files", json=version_files)
+        requests_mock.get(
+            "https://api.modrinth.com/v2/projects",
+            additional_matcher=_projects_query("AB"),
+            json=[{"id": "AB"}],
+        )
+        requests_mock.get(
+            "https://api.modrinth.com/v2/projects",
+            additional_matcher=_projects_query("CD"),
+            json=[{"id": "CD"}],
+        )
+
+        versions, known_hashes = Modpack._fetch_versions(frozenset(["ab", "cd"]))  # noqa: SLF001
+        projects = Modpack._fetch_projects(versions)  # noqa: SLF001
+
+        assert requests_mock.call_count == 4  # noqa: PLR2004
+
+        assert versions.keys() == {"ab", "cd"}
+        assert known_hashes == frozenset(["ab", "cd"])
+        assert projects == [{"id": "AB"}, {"id": "CD"}]
+
+    def test_from_files(
+        self,
+        test1_mrpack: bytes,
+        modrinth_requests: Callable[[], tuple[list[str], list[str]]],
+    ) -> None:
+        (modpack,) = Modpack.from_files(io.BytesIO(test1_mrpack))
+        assert modrinth_requests() == (["abcd", "fedc", "pqrs"], ["baz", "quux"])
 
         assert modpack.name == "Test Modpack"
         assert modpack.version == "1.1"
@@ -389,34 +461,22 @@ class TestModpack:
         assert mods[0].name == "Bar"
         assert mods[0].link == "https://modrinth.com/mod/bar"
         assert mods[0].version == "4.5.6"
-        assert mods[0].original_env == Env(
-            client=Requirement.OPTIONAL,
-            server=Requirement.OPTIONAL,
-        )
-        assert mods[0].overridden_env == Env(
-            client=Requirement.OPTIONAL,
-            server=Requirement.OPTIONAL,
-        )
-        assert mods[0].mod_license == "MIT"
-        assert mods[0].source_url == "example.com"
-        assert mods[0].issues_url == "example2.com"
+        assert mods[0].original_env == _ENV_UNKNOWN
+        assert mods[0].overridden_env == _ENV_UNKNOWN
+        assert mods[0].mod_license == ""
+        assert mods[0].source_url == ""
+        assert mods[0].issues_url == ""
         assert mods[0].game_versions == frozenset([GameVersion("1.19.4")])
         assert mods[0].latest_game_version == GameVersion("1.19.4")
 
         assert mods[1].name == "Foo"
         assert mods[1].link == "https://modrinth.com/mod/foo"
         assert mods[1].version == "1.2.3"
-        assert mods[1].original_env == Env(
-            client=Requirement.UNKNOWN,
-            server=Requirement.UNKNOWN,
-        )
-        assert mods[1].overridden_env == Env(
-            client=Requirement.REQUIRED,
-            server=Requirement.OPTIONAL,
-        )
-        assert mods[1].mod_license == ""
-        assert mods[1].source_url == ""
-        assert mods[1].issues_url == ""
+        assert mods[1].original_env == _ENV_OPTIONAL_REQUIRED
+        assert mods[1].overridden_env == _ENV_REQUIRED_OPTIONAL
+        assert mods[1].mod_license == "MIT"
+        assert mods[1].source_url == "example.com"
+        assert mods[1].issues_url == "example2.com"
         assert mods[1].game_versions == frozenset([GameVersion("1.19.2"), GameVersion("1.20")])
         assert mods[1].latest_game_version == GameVersion("1.20")
 
@@ -1,4 +1,15 @@
-from mrpack_utils.output import IncompatibleMods, MissingMods, Table, render, render_csv
+import io
+
+import pytest
+
+from mrpack_utils.output import (
+    IncompatibleMods,
+    MissingMods,
+    Table,
+    render,
+    render_csv,
+    write_csv,
+)
 
 # ruff: noqa: E741
 
@@ -43,6 +54,15 @@ class TestTable:
 a,b
 c,d"""
         )
+        with io.StringIO() as f:
+            t.write_csv(f)
+            assert (
+                f.getvalue()
+                == """A,B
+a,b
+c,d
+"""
+            )
 
 
 class TestMissingMods:
@@ -63,71 +83,52 @@ class TestMissingMods:
 
 
 class TestIncompatibleMods:
-    def test_render_normal(self) -> None:
-        i = IncompatibleMods(
-            num_mods=10,
-            game_version="1.19.2",
-            mods=set(),
-            curseforge_warning=False,
-        )
-        assert i.num_mods == 10  # noqa: PLR2004
-        assert i.game_version == "1.19.2"
-        assert i.mods == frozenset()
-        assert (
-            i.render()
-            == """For version 1.19.2:
-  All mods are compatible with this version"""
-        )
-
-        i = IncompatibleMods(
-            num_mods=10,
-            game_version="1.19.2",
-            mods={"B", "A"},
-            curseforge_warning=False,
-        )
-        assert i.num_mods == 10  # noqa: PLR2004
-        assert i.game_version == "1.19.2"
-        assert i.mods == frozenset(["A", "B"])
-        assert (
-            i.render()
-            == """For version 1.19.2:
+    @pytest.mark.parametrize(
+        ("mods", "curseforge_warning", "expected"),
+        [
+            (
+                set(),
+                False,
+                """For version 1.19.2:
+  All mods are compatible with this version""",
+            ),
+            (
+                {"B", "A"},
+                False,
+                """For version 1.19.2:
   2 out of 10 mods are incompatible with this version:
     A
-    B"""
-        )
-
-    def test_render_warning(self) -> None:
-        i = IncompatibleMods(
-            num_mods=10,
-            game_version="1.19.2",
-            mods=set(),
-            curseforge_warning=True,
-        )
-        assert i.num_mods == 10  # noqa: PLR2004
-        assert i.game_version == "1.19.2"
-        assert i.mods == frozenset()
-        assert (
-            i.render()
-            == """For version 1.19.2:
-  All Modrinth mods are compatible with this version (CurseForge mods must be checked manually)"""
-        )
-
+    B""",
+            ),
+            (
+                set(),
+                True,
+                """For version 1.19.2:
+  All Modrinth mods are compatible with this version (CurseForge mods must be checked manually)""",
+            ),
+            (
+                {"B", "A"},
+                True,
+                """For version 1.19.2:
+  2 out of 10 Modrinth mods are incompatible with this version (CurseForge mods must be checked manually):
+    A
+    B""",  # noqa: E501
+            ),
+        ],
+        ids=["normal-empty", "normal-nonempty", "warning-empty", "warning-nonempty"],
+    )
+    def test_render(self, mods: set[str], curseforge_warning: bool, expected: str) -> None:
         i = IncompatibleMods(
             num_mods=10,
             game_version="1.19.2",
-            mods={"B", "A"},
-            curseforge_warning=True,
+            mods=mods,
+            curseforge_warning=curseforge_warning,
         )
         assert i.num_mods == 10  # noqa: PLR2004
         assert i.game_version == "1.19.2"
-        assert i.mods == frozenset(["A", "B"])
-        assert (
-            i.render()
-            == """For version 1.19.2:
-  2 out of 10 Modrinth mods are incompatible with this version (CurseForge mods must be checked manually):
-    A
-    B"""  # noqa: E501
-        )
+        assert i.mods == frozenset(mods)
+        assert i.curseforge_warning == curseforge_warning
+        assert i.render() == expected
 
 
 class TestRender:
@@ -176,3 +177,16 @@ Mods supposed to be on Modrinth, but not found:
 a,b
 c,d"""
         )
+
+        with io.StringIO() as f:
+            write_csv([], f)
+            assert f.getvalue() == ""
+        with io.StringIO() as f:
+            write_csv(data, f)
+            assert (
+                f.getvalue()
+                == """A,B
+a,b
+c,d
+"""
+            )